@@ -3,11 +3,10 @@ import cv2
 import time
 import config
 import tempfile
-import base64
-import os
 from modules.detector import ObjectDetector
 from modules.tracker import ObjectTracker
 from modules.analytics import AnalyticsEngine
+from modules.alerts import AlertDispatcher, PanicDebouncer, SoundSink, LogFileSink, WebhookSink
 
 # --- 1. PAGE CONFIGURATION ---
 st.set_page_config(
@@ -196,20 +195,18 @@ def load_system():
     tracker = ObjectTracker()
     return detector, tracker
 
-# --- 5. AUDIO ALERT FUNCTION ---
-def autoplay_audio(file_path: str):
-    try:
-        with open(file_path, "rb") as f:
-            data = f.read()
-            b64 = base64.b64encode(data).decode()
-            md = f"""
-                <audio autoplay>
-                <source src="data:audio/mp3;base64,{b64}" type="audio/mp3">
-                </audio>
-                """
-            st.markdown(md, unsafe_allow_html=True)
-    except FileNotFoundError:
-        pass 
+# --- 5. ALERT DISPATCH ---
+def build_alerts(enable_audio):
+    # Sinks run on a background worker so alert delivery never slows the frame loop
+    sound_sink = SoundSink(config.ALERT_SOUND_PATH) if enable_audio else None
+    sinks = [sound_sink] if sound_sink else []
+    if config.ALERT_LOG_PATH:
+        sinks.append(LogFileSink(config.ALERT_LOG_PATH))
+    if config.ALERT_WEBHOOK_URL:
+        sinks.append(WebhookSink(config.ALERT_WEBHOOK_URL))
+
+    debouncer = PanicDebouncer(config.PANIC_MIN_ON_SECONDS, config.PANIC_MIN_OFF_SECONDS, config.PANIC_RELEASE_RATIO)
+    return AlertDispatcher(sinks, debouncer), sound_sink
 
 def main():
     # --- CUSTOM NAVBAR ---
@@ -337,98 +334,106 @@ def main():
                 
                 cap = cv2.VideoCapture(video_path)
                 prev_time = 0
-                alert_sound_path = "alert.mp3" 
+                alerts, sound_sink = build_alerts(enable_audio)
                 
-                while cap.isOpened() and st.session_state['run_detection']:
-                    ret, frame = cap.read()
-                    if not ret:
-                        st.toast("✅ Video Playback Finished", icon="✅")
-                        st.session_state['run_detection'] = False
-                        break
-
-                    # 1. Processing
-                    frame_resized = cv2.resize(frame, (config.FRAME_WIDTH, config.FRAME_HEIGHT))
-                    detections = detector.detect(frame_resized, conf_thresh)
-                    tracks = tracker.update_tracks(detections, frame_resized)
-                    is_panic, avg_velocity = analytics.process_behavior(tracks, panic_thresh)
-
-                    # 2. Visualization
-                    visual_frame = frame_resized.copy()
-                    if show_heatmap:
-                        visual_frame = analytics.get_heatmap_overlay(visual_frame)
-
-                    for track in tracks:
-                        if not track.is_confirmed(): continue
-                        track_id = track.track_id
-                        ltrb = track.to_ltrb()
-                        
-                        # Logic Colors
-                        color = (0, 0, 255) if is_panic else (0, 255, 127) # Red / Green
-                        
-                        # Fancy Bounding Box
-                        p1 = (int(ltrb[0]), int(ltrb[1]))
-                        p2 = (int(ltrb[2]), int(ltrb[3]))
-                        
-                        # Corner Style Box
-                        cv2.rectangle(visual_frame, p1, p2, color, 1)
-                        
-                        # ID Tag
-                        label = f"ID {track_id}"
-                        (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
-                        cv2.rectangle(visual_frame, (p1[0], p1[1]-20), (p1[0]+w+10, p1[1]), color, -1)
-                        cv2.putText(visual_frame, label, (p1[0]+5, p1[1]-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255,255,255), 1)
-
-                    # 3. Alert Logic
-                    log_content = ""
-                    if is_panic:
-                        # Warning Overlay
-                        overlay = visual_frame.copy()
-                        cv2.rectangle(overlay, (0, 0), (config.FRAME_WIDTH, config.FRAME_HEIGHT), (0, 0, 255), -1)
-                        cv2.addWeighted(overlay, 0.3, visual_frame, 0.7, 0, visual_frame)
-                        cv2.putText(visual_frame, "!!! PANIC DETECTED !!!", (100, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
-                        
-                        status_html = f"""<div class="metric-container" style="border-color:#FF0055; box-shadow:0 0 30px rgba(255,0,85,0.6);"><div class="metric-label">Status</div><div class="metric-value status-danger">PANIC</div></div>"""
-                        
-                        log_content = f"""
-                        <div class="console-logs">
-                        <span style="color:red;">[CRITICAL] High Velocity Detected: {avg_velocity:.2f} px/f</span><br>
-                        <span style="color:red;">[ALERT] Triggering Safety Protocols...</span><br>
-                        > Occupancy: {analytics.occupancy}<br>
-                        > Analysis Active...
-                        </div>
-                        """
-                        
-                        if enable_audio and os.path.exists(alert_sound_path):
-                            autoplay_audio(alert_sound_path)
-                    else:
-                        status_html = f"""<div class="metric-container"><div class="metric-label">Status</div><div class="metric-value status-safe">SAFE</div></div>"""
-                        log_content = f"""
-                        <div class="console-logs">
-                        <span style="color:#00FF00;">[NORMAL] System Nominal</span><br>
-                        > Velocity: {avg_velocity:.2f} px/f<br>
-                        > Occupancy: {analytics.occupancy}<br>
-                        > Tracking {len(tracks)} individuals...
-                        </div>
-                        """
+                try:
+                    while cap.isOpened() and st.session_state['run_detection']:
+                        ret, frame = cap.read()
+                        if not ret:
+                            st.toast("✅ Video Playback Finished", icon="✅")
+                            st.session_state['run_detection'] = False
+                            break
+
+                        # 1. Processing
+                        frame_resized = cv2.resize(frame, (config.FRAME_WIDTH, config.FRAME_HEIGHT))
+                        detections = detector.detect(frame_resized, conf_thresh)
+                        tracks = tracker.update_tracks(detections, frame_resized)
+                        _, avg_velocity = analytics.process_behavior(tracks, panic_thresh)
+                        is_panic = alerts.update(avg_velocity, analytics.occupancy, panic_thresh)
+
+                        # 2. Visualization
+                        visual_frame = frame_resized.copy()
+                        if show_heatmap:
+                            visual_frame = analytics.get_heatmap_overlay(visual_frame)
+
+                        for track in tracks:
+                            if not track.is_confirmed(): continue
+                            track_id = track.track_id
+                            ltrb = track.to_ltrb()
+
+                            # Logic Colors
+                            color = (0, 0, 255) if is_panic else (0, 255, 127) # Red / Green
+
+                            # Fancy Bounding Box
+                            p1 = (int(ltrb[0]), int(ltrb[1]))
+                            p2 = (int(ltrb[2]), int(ltrb[3]))
+
+                            # Corner Style Box
+                            cv2.rectangle(visual_frame, p1, p2, color, 1)
+
+                            # ID Tag
+                            label = f"ID {track_id}"
+                            (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1)
+                            cv2.rectangle(visual_frame, (p1[0], p1[1]-20), (p1[0]+w+10, p1[1]), color, -1)
+                            cv2.putText(visual_frame, label, (p1[0]+5, p1[1]-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255,255,255), 1)
+
+                        # 3. Alert Logic
+                        log_content = ""
+                        if is_panic:
+                            # Warning Overlay
+                            overlay = visual_frame.copy()
+                            cv2.rectangle(overlay, (0, 0), (config.FRAME_WIDTH, config.FRAME_HEIGHT), (0, 0, 255), -1)
+                            cv2.addWeighted(overlay, 0.3, visual_frame, 0.7, 0, visual_frame)
+                            cv2.putText(visual_frame, "!!! PANIC DETECTED !!!", (100, 250), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+
+                            status_html = f"""<div class="metric-container" style="border-color:#FF0055; box-shadow:0 0 30px rgba(255,0,85,0.6);"><div class="metric-label">Status</div><div class="metric-value status-danger">PANIC</div></div>"""
+
+                            log_content = f"""
+                            <div class="console-logs">
+                            <span style="color:red;">[CRITICAL] High Velocity Detected: {avg_velocity:.2f} px/f</span><br>
+                            <span style="color:red;">[ALERT] Triggering Safety Protocols...</span><br>
+                            > Occupancy: {analytics.occupancy}<br>
+                            > Analysis Active...
+                            </div>
+                            """
+                        else:
+                            status_html = f"""<div class="metric-container"><div class="metric-label">Status</div><div class="metric-value status-safe">SAFE</div></div>"""
+                            log_content = f"""
+                            <div class="console-logs">
+                            <span style="color:#00FF00;">[NORMAL] System Nominal</span><br>
+                            > Velocity: {avg_velocity:.2f} px/f<br>
+                            > Occupancy: {analytics.occupancy}<br>
+                            > Tracking {len(tracks)} individuals...
+                            </div>
+                            """
+
+                        # Audio only changes on debounced transitions, rendered by the script thread
+                        if sound_sink:
+                            audio_html = sound_sink.drain()
+                            if audio_html is not None:
+                                audio_placeholder.markdown(audio_html, unsafe_allow_html=True)
+
+                        # 4. FPS Calculation
+                        curr_time = time.time()
+                        fps = 1 / (curr_time - prev_time) if (curr_time - prev_time) > 0 else 0
+                        prev_time = curr_time
+
+                        # 5. UI Updates
+                        kpi_occupancy.markdown(f"""<div class="metric-container"><div class="metric-label">Live Occupancy</div><div class="metric-value">{analytics.occupancy}</div></div>""", unsafe_allow_html=True)
+                        kpi_velocity.markdown(f"""<div class="metric-container"><div class="metric-label">Crowd Velocity</div><div class="metric-value">{avg_velocity:.1f}</div></div>""", unsafe_allow_html=True)
+                        kpi_status.markdown(status_html, unsafe_allow_html=True)
+                        kpi_fps.markdown(f"""<div class="metric-container"><div class="metric-label">System FPS</div><div class="metric-value">{int(fps)}</div></div>""", unsafe_allow_html=True)
+
+                        log_placeholder.markdown(log_content, unsafe_allow_html=True)
+
+                        video_placeholder.image(cv2.cvtColor(visual_frame, cv2.COLOR_BGR2RGB), channels="RGB", use_column_width=True)
+
+                finally:
+                    alerts.close()
+                    cap.release()
+                    if sound_sink:
                         audio_placeholder.empty()
 
-                    # 4. FPS Calculation
-                    curr_time = time.time()
-                    fps = 1 / (curr_time - prev_time) if (curr_time - prev_time) > 0 else 0
-                    prev_time = curr_time
-
-                    # 5. UI Updates
-                    kpi_occupancy.markdown(f"""<div class="metric-container"><div class="metric-label">Live Occupancy</div><div class="metric-value">{analytics.occupancy}</div></div>""", unsafe_allow_html=True)
-                    kpi_velocity.markdown(f"""<div class="metric-container"><div class="metric-label">Crowd Velocity</div><div class="metric-value">{avg_velocity:.1f}</div></div>""", unsafe_allow_html=True)
-                    kpi_status.markdown(status_html, unsafe_allow_html=True)
-                    kpi_fps.markdown(f"""<div class="metric-container"><div class="metric-label">System FPS</div><div class="metric-value">{int(fps)}</div></div>""", unsafe_allow_html=True)
-                    
-                    log_placeholder.markdown(log_content, unsafe_allow_html=True)
-                    
-                    video_placeholder.image(cv2.cvtColor(visual_frame, cv2.COLOR_BGR2RGB), channels="RGB", use_column_width=True)
-
-                cap.release()
-
     # ---------------- PAGE 2: ABOUT ----------------
     elif st.session_state['current_page'] == 'About':
         st.markdown("## About Karma AI")
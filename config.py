@@ -12,6 +12,14 @@ MODEL_PATH = 'yolov8n.pt'  # Will download automatically
 PANIC_VELOCITY_THRESHOLD = 20.0  # Pixels per frame movement
 HEATMAP_INTENSITY = 0.05         # How fast the heatmap turns red
 
+# Alert Settings
+ALERT_SOUND_PATH = 'alert.mp3'
+ALERT_LOG_PATH = None            # e.g. 'alerts.log'
+ALERT_WEBHOOK_URL = None         # e.g. 'http://127.0.0.1:8000/alerts'
+PANIC_MIN_ON_SECONDS = 0.5       # Panic must persist this long before alarming
+PANIC_MIN_OFF_SECONDS = 2.0      # Calm must persist this long before clearing
+PANIC_RELEASE_RATIO = 0.8        # Clear only below threshold * ratio
+
 # Colors (BGR Format)
 COLOR_RED = (0, 0, 255)
 COLOR_GREEN = (0, 255, 0)
@@ -0,0 +1,165 @@
+import base64
+import json
+import logging
+import queue
+import threading
+import time
+import urllib.request
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def load_audio_payload(file_path):
+    # Read + base64-encode the alert sound once per path (OSError is not cached)
+    with open(file_path, "rb") as f:
+        return base64.b64encode(f.read()).decode()
+
+
+class PanicDebouncer:
+    def __init__(self, min_on_seconds, min_off_seconds, release_ratio):
+        # Panic must persist min_on_seconds before we raise it, and velocity must
+        # stay below threshold * release_ratio for min_off_seconds before we clear it
+        self.min_on_seconds = min_on_seconds
+        self.min_off_seconds = min_off_seconds
+        self.release_ratio = release_ratio
+
+        # State
+        self.is_panic = False
+        self._pending_since = None
+
+    def update(self, avg_velocity, panic_threshold, now=None):
+        now = time.monotonic() if now is None else now
+
+        if self.is_panic:
+            crossing = avg_velocity < panic_threshold * self.release_ratio
+            hold = self.min_off_seconds
+        else:
+            crossing = avg_velocity > panic_threshold
+            hold = self.min_on_seconds
+
+        if not crossing:
+            self._pending_since = None
+            return self.is_panic
+
+        if self._pending_since is None:
+            self._pending_since = now
+        if now - self._pending_since >= hold:
+            self.is_panic = not self.is_panic
+            self._pending_since = None
+
+        return self.is_panic
+
+
+class SoundSink:
+    def __init__(self, file_path):
+        # Payload is encoded once; the worker only swaps a ready-made HTML string
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._pending = None
+
+    def send(self, event):
+        if event["state"] == "PANIC":
+            try:
+                b64 = load_audio_payload(self.file_path)
+            except FileNotFoundError:
+                return
+            html = f"""
+                <audio autoplay loop>
+                <source src="data:audio/mp3;base64,{b64}" type="audio/mp3">
+                </audio>
+                """
+        else:
+            html = ""
+
+        with self._lock:
+            self._pending = html
+
+    def drain(self):
+        # Called from the Streamlit script thread; returns None when nothing changed
+        with self._lock:
+            html, self._pending = self._pending, None
+        return html
+
+
+class LogFileSink:
+    def __init__(self, file_path):
+        self.file_path = file_path
+
+    def send(self, event):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(event["timestamp"]))
+        line = f"{stamp} [{event['state']}] velocity={event['velocity']:.2f} occupancy={event['occupancy']}\n"
+        with open(self.file_path, "a") as f:
+            f.write(line)
+
+
+class WebhookSink:
+    def __init__(self, url, timeout=2.0):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, event):
+        body = json.dumps(event).encode()
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=self.timeout):
+            pass
+
+
+class AlertDispatcher:
+    def __init__(self, sinks, debouncer, max_queue=32):
+        self.sinks = list(sinks)
+        self.debouncer = debouncer
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="karma-alerts", daemon=True)
+        self._worker.start()
+
+    def update(self, avg_velocity, occupancy, panic_threshold):
+        # Hot path: debounce + enqueue on transitions only, never blocks
+        was_panic = self.debouncer.is_panic
+        is_panic = self.debouncer.update(avg_velocity, panic_threshold)
+
+        if is_panic != was_panic:
+            event = {
+                "state": "PANIC" if is_panic else "SAFE",
+                "velocity": float(avg_velocity),
+                "occupancy": int(occupancy),
+                "timestamp": time.time(),
+            }
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                pass  # Drop rather than stall the frame loop
+
+        return is_panic
+
+    def close(self, timeout=1.0):
+        # Send a closing SAFE event so sinks never stay latched in panic
+        if self.debouncer.is_panic:
+            self.debouncer.is_panic = False
+            event = {
+                "state": "SAFE",
+                "velocity": 0.0,
+                "occupancy": 0,
+                "timestamp": time.time(),
+            }
+            try:
+                self._queue.put(event, timeout=timeout)
+            except queue.Full:
+                pass
+
+        self._stop.set()
+        self._worker.join(timeout)
+
+    def _run(self):
+        # Keep delivering until stopped and the queue has been flushed
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                event = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            for sink in self.sinks:
+                # A failing sink must not take down the others
+                try:
+                    sink.send(event)
+                except Exception:
+                    logging.exception("Alert sink %s failed", type(sink).__name__)
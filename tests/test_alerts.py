@@ -0,0 +1,85 @@
+from modules.alerts import AlertDispatcher, PanicDebouncer
+
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+
+    def send(self, event):
+        self.events.append(event["state"])
+
+
+class FailingSink:
+    def send(self, event):
+        raise RuntimeError("sink down")
+
+
+class SteppedDebouncer(PanicDebouncer):
+    # Feeds a fake clock so the dispatcher can be driven deterministically
+    def __init__(self):
+        super().__init__(min_on_seconds=1.0, min_off_seconds=1.0, release_ratio=0.8)
+        self.clock = 0.0
+
+    def update(self, avg_velocity, panic_threshold, now=None):
+        self.clock += 0.5
+        return super().update(avg_velocity, panic_threshold, now=self.clock)
+
+
+def test_min_on_and_min_off_timing():
+    d = PanicDebouncer(min_on_seconds=0.5, min_off_seconds=2.0, release_ratio=0.8)
+    assert d.update(30, 20, now=0.0) is False
+    assert d.update(30, 20, now=0.4) is False
+    assert d.update(30, 20, now=0.5) is True
+
+    assert d.update(10, 20, now=1.0) is True
+    assert d.update(10, 20, now=2.9) is True
+    assert d.update(10, 20, now=3.0) is False
+
+
+def test_release_band_keeps_panic_latched():
+    d = PanicDebouncer(min_on_seconds=0.0, min_off_seconds=1.0, release_ratio=0.8)
+    assert d.update(30, 20, now=0.0) is True
+
+    # 17 is below the threshold but above threshold * release_ratio (16)
+    assert d.update(17, 20, now=0.5) is True
+    assert d.update(17, 20, now=5.0) is True
+
+    # Dipping below the band starts the release timer; re-arming resets it
+    assert d.update(10, 20, now=5.5) is True
+    assert d.update(25, 20, now=6.0) is True
+    assert d.update(10, 20, now=6.4) is True
+    assert d.update(10, 20, now=7.3) is True
+    assert d.update(10, 20, now=7.4) is False
+
+
+def test_single_non_crossing_frame_resets_timer():
+    d = PanicDebouncer(min_on_seconds=1.0, min_off_seconds=1.0, release_ratio=0.8)
+    assert d.update(30, 20, now=0.0) is False
+    assert d.update(30, 20, now=0.9) is False
+    assert d.update(10, 20, now=1.0) is False
+    assert d.update(30, 20, now=1.1) is False
+    assert d.update(30, 20, now=2.0) is False
+    assert d.update(30, 20, now=2.1) is True
+
+
+def test_dispatcher_delivers_transitions_only():
+    recorder = RecordingSink()
+    alerts = AlertDispatcher([FailingSink(), recorder], SteppedDebouncer())
+
+    for velocity in [30, 30, 30, 30, 10, 10, 10, 10]:
+        alerts.update(velocity, 3, 20)
+    alerts.close()
+
+    assert recorder.events == ["PANIC", "SAFE"]
+
+
+def test_close_emits_safe_when_latched():
+    recorder = RecordingSink()
+    alerts = AlertDispatcher([recorder], SteppedDebouncer())
+
+    for velocity in [30, 30, 30]:
+        alerts.update(velocity, 3, 20)
+    alerts.close()
+
+    assert recorder.events == ["PANIC", "SAFE"]
+    assert not alerts._worker.is_alive()